@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-"""Endpoint for ingesting QA test‑cases from an Excel workbook into the
+"""Endpoints for ingesting QA test‑cases from Excel workbooks into the
 vector‑store.
 
 The route can be called from the front end right after a manager uploads a new
@@ -10,24 +10,37 @@ spreadsheet :
 await api.post('/ingest', { filename: 'docs/test_cases.xlsx' })
 ```
 
-The server will read & pre‑process the file via :class:`TestCaseLoader` and
-(optionally) feed embeddings into Milvus in a later step.  For now we return a
-simple JSON payload with the number of extracted test‑cases.
+For many suites at once there are two more entry points:
+
+* ``POST /ingest/batch``  – JSON body with ``filenames`` and/or ``directory``;
+* ``POST /ingest/upload`` – ``multipart/form-data`` with one or more ``files``.
+
+Workbooks are parsed in a process pool (see :mod:`app.services.ingest_pool`),
+so the event loop stays free and all cores are used.  Per‑file results are
+merged into one JSON payload stored in Redis under a single ``job_id``.
 """
 
+import os
+import shutil
+import tempfile
 import uuid
 from pathlib import Path
+from typing import List, Optional
 
-import pandas as pd
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, File, HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
-from app.services.case_loader import TestCaseLoader
+from app.core.config import get_settings
 from app.services import cache
+from app.services import ingest_pool
 
 
 router = APIRouter(prefix="/ingest", tags=["ingest"])
 
+_SETTINGS = get_settings()
+_CHUNK_SIZE = 1 << 20  # 1 MiB, буфер копирования upload → temp-файл
+
 
 class IngestRequest(BaseModel):
     filename: str = Field(..., description="Relative path to the Excel file, e.g. 'docs/test_cases.xlsx'.")
@@ -39,36 +52,115 @@ class IngestResponse(BaseModel):
     ttl: int = Field(..., description="Время жизни записи, сек")
 
 
+class BatchIngestRequest(BaseModel):
+    filenames: List[str] = Field(default_factory=list, description="Пути к Excel-файлам на сервере")
+    directory: Optional[str] = Field(None, description="Каталог, из которого берутся все *.xlsx")
+
+
+class FileResult(BaseModel):
+    filename: str
+    imported: int = 0
+    error: Optional[str] = None
+
+
+class BatchIngestResponse(IngestResponse):
+    files: List[FileResult] = Field(..., description="Результат по каждому файлу")
+
+
+async def _store(results: List[ingest_pool.WorkbookResult]) -> dict:
+    """Merge per‑file frames, save them to Redis and build the response."""
+    df_cases = ingest_pool.merge_results(results)
+    files = [FileResult(filename=r.filename, imported=r.imported, error=r.error) for r in results]
+    if df_cases is None:
+        raise HTTPException(422, detail=[f.model_dump() for f in files])
+
+    payload = df_cases.to_json(orient="records")
+    job_id = uuid.uuid4().hex
+    ttl = cache.DEFAULT_TTL
+    await cache.set_json(job_id, payload, ttl=ttl)
+
+    return {
+        "imported": sum(r.imported for r in results),
+        "job_id": job_id,
+        "ttl": ttl,
+        "files": files,
+    }
+
+
+def _copy_to_disk(upload: UploadFile, suffix: str) -> Path:
+    """Blocking part of :func:`_spool` – runs in the threadpool."""
+    with tempfile.NamedTemporaryFile(prefix="ingest-", suffix=suffix, delete=False) as tmp:
+        try:
+            upload.file.seek(0)
+            shutil.copyfileobj(upload.file, tmp, _CHUNK_SIZE)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    return Path(tmp.name)
+
+
+async def _spool(upload: UploadFile) -> Path:
+    """Copy *upload* to a temp file on disk without blocking the event loop.
+
+    Pool workers need a real path.  Starlette has already buffered the body in
+    its own spooled file by now, so the size cap only rejects oversized
+    workbooks before parsing – it does not bound the request body itself.
+    """
+    limit = _SETTINGS.ingest_max_upload_mb * (1 << 20)
+    too_large = HTTPException(
+        status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"'{upload.filename}' exceeds {_SETTINGS.ingest_max_upload_mb} MB",
+    )
+    if upload.size is not None and upload.size > limit:
+        raise too_large
+
+    suffix = Path(upload.filename or "").suffix or ".xlsx"
+    path = await run_in_threadpool(_copy_to_disk, upload, suffix)
+    if path.stat().st_size > limit:  # upload.size неизвестен (нет Content-Length)
+        path.unlink(missing_ok=True)
+        raise too_large
+    return path
+
+
 @router.post("", response_model=IngestResponse)
 async def ingest(req: IngestRequest):  # noqa: D401 – simple wrapper
     """Read the workbook and return how many cases we have just imported."""
+    [result] = await ingest_pool.parse_many([Path(req.filename).resolve()], [req.filename])
+    if result.error is not None:
+        code = 404 if result.not_found else 422
+        raise HTTPException(code, detail=result.error)
+    return await _store([result])
+
+
+@router.post("/batch", response_model=BatchIngestResponse)
+async def ingest_batch(req: BatchIngestRequest):
+    """Parse many server‑side workbooks (explicit list and/or a directory) in parallel."""
+    paths = [Path(name).resolve() for name in req.filenames]
+    names = list(req.filenames)
+    if req.directory is not None:
+        try:
+            found = ingest_pool.collect_workbooks(req.directory)
+        except FileNotFoundError as exc:
+            raise HTTPException(404, detail=str(exc)) from exc
+        paths.extend(found)
+        names.extend(str(p) for p in found)
+    if not paths:
+        raise HTTPException(422, detail="Нужно указать 'filenames' или непустой 'directory'")
+
+    results = await ingest_pool.parse_many(paths, names)
+    return await _store(results)
+
+
+@router.post("/upload", response_model=BatchIngestResponse)
+async def ingest_upload(files: List[UploadFile] = File(..., description="Excel-файлы с тест-кейсами")):
+    """Accept multipart uploads, spool them to disk and parse them in parallel."""
+    paths: List[Path] = []
     try:
-        abs_path = Path(req.filename).resolve()
-        loader = TestCaseLoader(abs_path)
-        cases = loader.load()
-        # 2. Сериализация в JSON (records - самый универсальный)
-        df_all = pd.concat(cases, ignore_index=True)
-        df_cases = (
-            df_all
-            .groupby("Id", as_index=False)
-            .agg({
-                "Direction":    "first",
-                "Section":      "first",
-                "TestCaseName": "first",
-                "Steps":        lambda s: " ".join(s.dropna()),
-                "ExpectedResult": "first",
-            })
-        )
-        payload = df_cases.to_json(orient="records")
-
-        # 3. Сохранение в Redis
-        job_id = uuid.uuid4().hex
-        ttl = cache.DEFAULT_TTL
-        await cache.set_json(job_id, payload, ttl=ttl)
-
-        return {"imported": len(cases), "job_id": job_id, "ttl": ttl}
-
-    except FileNotFoundError as exc:
-        raise HTTPException(404, detail=f"File not found: {exc}") from exc
-    except Exception as exc:  # noqa: BLE001
-        raise HTTPException(422, detail=str(exc)) from exc
\ No newline at end of file
+        for upload in files:
+            paths.append(await _spool(upload))
+        results = await ingest_pool.parse_many(paths, [f.filename or p.name for f, p in zip(files, paths)])
+    finally:
+        for path in paths:
+            path.unlink(missing_ok=True)
+    return await _store(results)
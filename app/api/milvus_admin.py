@@ -6,6 +6,18 @@ Milvus — административные и поисковые операци
 •   GET    /milvus/{collection}/dump        — печатает содержимое коллекции в консоль
 •   POST   /milvus/search                   — поиск по idx / inner_id / векторному запросу
 •   DELETE /milvus/{collection}             — полное удаление коллекции
+•   POST   /milvus/{collection}/snapshot    — выгрузка коллекции в snapshot (.npy + .parquet)
+•   POST   /milvus/restore                  — восстановление коллекции из snapshot
+
+Эндпоинты разделены на два роутера, чтобы процесс можно было поднять
+«только для поиска» или «только для администрирования» (см. ``API_GROUPS``):
+
+•   ``search_router`` — /collections и /search;
+•   ``router``        — dump, drop, snapshot, restore.
+
+Векторы и «тяжёлые» текстовые поля (steps / expected_result) по умолчанию
+в ответ не попадают — их нужно явно запросить флагами ``with_vector`` /
+``with_text``.
 """
 
 from typing import List, Optional
@@ -15,9 +27,11 @@ from pydantic import BaseModel, Field, conlist
 import numpy as np
 from typing import Any, List, Dict
 
-from app.services.milvus import get_client
+from app.services import snapshot
+from app.services.milvus import TEXT_FIELDS, decode_vector, get_client, vector_dtype
 
 router = APIRouter(prefix="/milvus", tags=["milvus"])
+search_router = APIRouter(prefix="/milvus", tags=["milvus"])
 
 
 # -------------------------------------------------------------------------#
@@ -26,7 +40,6 @@ router = APIRouter(prefix="/milvus", tags=["milvus"])
 
 _OUT_FIELDS = [
     "idx",
-    "vector",
     "inner_id",
     "direction_name",
     "section_name",
@@ -34,6 +47,15 @@ _OUT_FIELDS = [
 ]
 
 
+def _out_fields(with_vector: bool = False, with_text: bool = False) -> List[str]:
+    fields = list(_OUT_FIELDS)
+    if with_vector:
+        fields.append("vector")
+    if with_text:
+        fields.extend(TEXT_FIELDS)
+    return fields
+
+
 def _collection_or_404(client, name: str):
     if not client.has_collection(name):
         raise HTTPException(status_code=404, detail=f"Collection '{name}' not found")
@@ -47,7 +69,7 @@ def _collection_or_404(client, name: str):
 class CollectionsResponse(BaseModel):
     collections: List[str]
 
-@router.get("/collections", response_model=CollectionsResponse)
+@search_router.get("/collections", response_model=CollectionsResponse)
 def list_collections():
     """
     Возвращает список всех коллекций, доступных в Milvus.
@@ -73,11 +95,30 @@ def _to_py(obj: Any) -> Any:
         return {k: _to_py(v) for k, v in obj.items()}
     return obj                                # обычные int/float/str остаются как есть
 
+
+def _serialize(rows: List[Dict[str, Any]], dtype: Optional[type] = None) -> List[Dict[str, Any]]:
+    """Декодирует поле ``vector`` (float16 приходит как bytes) и чистит NumPy-типы.
+
+    Для результатов ``search`` поля лежат внутри ``entity``.
+    """
+    out = []
+    for row in rows:
+        row = dict(row)
+        target = row
+        if "entity" in row:
+            target = row["entity"] = dict(row["entity"])
+        if dtype is not None and "vector" in target:
+            target["vector"] = decode_vector(target["vector"], dtype).astype(float)
+        out.append(_to_py(row))
+    return out
+
 class DumpResponse(BaseModel):
     rows: List[Dict[str, Any]]
 
 @router.get("/{collection}/dump", response_model=DumpResponse)
-def dump_collection(collection: str, limit: int = 1000):
+def dump_collection(
+    collection: str, limit: int = 1000, with_vector: bool = False, with_text: bool = False
+):
     client = get_client()
     _collection_or_404(client, collection)
 
@@ -85,10 +126,10 @@ def dump_collection(collection: str, limit: int = 1000):
         collection_name=collection,
         filter="idx >= 0",
         limit=limit,
-        output_fields=_OUT_FIELDS,
+        output_fields=_out_fields(with_vector, with_text),
     )
-    safe_rows = [_to_py(row) for row in raw_rows]
-    return {"rows": safe_rows}
+    dtype = vector_dtype(client, collection) if with_vector else None
+    return {"rows": _serialize(raw_rows, dtype)}
 
 
 
@@ -112,12 +153,14 @@ class SearchRequest(BaseModel):
         None, description="Нормированный эмбеддинг длиной 768 (mode=semantic)"
     )
     limit: int = Field(10, ge=1, le=128, description="Сколько результатов вернуть")
+    with_vector: bool = Field(False, description="Вернуть эмбеддинги в ответе")
+    with_text: bool = Field(False, description="Вернуть steps / expected_result")
 
 class SearchResponse(BaseModel):
     results: List[dict]
 
 
-@router.post(
+@search_router.post(
     "/search",
     response_model=SearchResponse,
     status_code=status.HTTP_200_OK,
@@ -126,14 +169,19 @@ class SearchResponse(BaseModel):
 def search(request: SearchRequest):
     client = get_client()
     _collection_or_404(client, request.collection)
+    out_fields = _out_fields(request.with_vector, request.with_text)
+    # describe_collection нужен только там, где участвуют векторы
+    needs_dtype = request.with_vector or request.mode == "semantic"
+    dtype = vector_dtype(client, request.collection) if needs_dtype else None
+    result_dtype = dtype if request.with_vector else None
 
     if request.mode == "idx":
         if not request.idx:
             raise HTTPException(422, detail="Поле 'idx' обязательно при mode=idx")
         rows = client.get(
-            collection_name=request.collection, ids=request.idx, output_fields=_OUT_FIELDS
+            collection_name=request.collection, ids=request.idx, output_fields=out_fields
         )
-        return {"results": rows}
+        return {"results": _serialize(rows, result_dtype)}
 
     if request.mode == "inner_id":
         if request.inner_id is None:
@@ -143,9 +191,9 @@ def search(request: SearchRequest):
         rows = client.query(
             collection_name=request.collection,
             filter=f"inner_id == {request.inner_id}",
-            output_fields=_OUT_FIELDS,
+            output_fields=out_fields,
         )
-        return {"results": rows}
+        return {"results": _serialize(rows, result_dtype)}
 
     if request.mode == "semantic":
         if request.vector is None:
@@ -155,12 +203,12 @@ def search(request: SearchRequest):
         hits = client.search(
             collection_name=request.collection,
             anns_field="vector",
-            data=[request.vector],
+            data=[np.asarray(request.vector, dtype=dtype)],
             limit=request.limit,
-            output_fields=_OUT_FIELDS,
+            output_fields=out_fields,
             search_params={"metric_type": "COSINE", "params": {}},
         )
-        return {"results": hits[0]}
+        return {"results": _serialize(hits[0], result_dtype)}
 
     raise HTTPException(422, "Неподдерживаемый режим поиска")
 
@@ -185,3 +233,70 @@ def drop_collection(collection: str):
     client.drop_collection(collection_name=collection)
     return {"dropped": collection}
 
+
+# -------------------------------------------------------------------------#
+#                            snapshot / restore                            #
+# -------------------------------------------------------------------------#
+
+# имя, а не путь; без ведущей точки — такие имена занимают временные каталоги экспорта
+_SNAPSHOT_NAME = r"^[\w-][\w.-]*$"
+
+
+class SnapshotRequest(BaseModel):
+    name: Optional[str] = Field(
+        None, pattern=_SNAPSHOT_NAME, description="Имя snapshot в SNAPSHOT_DIR (по умолчанию — имя коллекции)"
+    )
+
+
+class SnapshotResponse(BaseModel):
+    collection: str
+    count: int
+    dim: int
+    dtype: str
+    created_at: str
+    path: str
+
+
+@router.post("/{collection}/snapshot", response_model=SnapshotResponse, status_code=201)
+def snapshot_collection(collection: str, request: Optional[SnapshotRequest] = None):
+    """
+    Выгружает векторы коллекции в .npy, а скалярные поля — в .parquet.
+    """
+    client = get_client()
+    _collection_or_404(client, collection)
+    try:
+        name = request.name if request is not None else None
+        out_dir = snapshot.snapshot_path(name or collection)
+        return snapshot.export_snapshot(collection, out_dir)
+    except ValueError as exc:
+        raise HTTPException(422, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        raise HTTPException(409, detail=str(exc)) from exc
+
+
+class RestoreRequest(BaseModel):
+    snapshot: str = Field(..., pattern=_SNAPSHOT_NAME, description="Имя snapshot в SNAPSHOT_DIR")
+    collection: Optional[str] = Field(None, description="Целевая коллекция (по умолчанию — исходная)")
+    profile: Optional[str] = Field(None, description="Профиль хранения: full | float16 | sq8 | compact")
+
+
+class RestoreResponse(BaseModel):
+    restored: int
+    collection: str
+
+
+@router.post("/restore", response_model=RestoreResponse, status_code=201)
+def restore_collection(request: RestoreRequest):
+    """
+    Создаёт коллекцию из snapshot без повторного прогона модели.
+    """
+    try:
+        return snapshot.restore_snapshot(
+            snapshot.snapshot_path(request.snapshot), request.collection, profile=request.profile
+        )
+    except FileNotFoundError as exc:
+        raise HTTPException(404, detail=str(exc)) from exc
+    except FileExistsError as exc:
+        raise HTTPException(409, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(422, detail=str(exc)) from exc
@@ -0,0 +1,50 @@
+"""Command‑line entry point for maintenance tasks.
+
+    python -m app.cli snapshot testcases_v1 [--out snapshots/tc_2025_06]
+    python -m app.cli restore  snapshots/tc_2025_06 [--collection testcases_v1] [--profile compact]
+
+``--out`` and the restore path are ordinary filesystem paths (relative to the
+current directory); only the HTTP API resolves bare names under SNAPSHOT_DIR.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+
+from app.services import snapshot
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_snap = sub.add_parser("snapshot", help="Выгрузить коллекцию Milvus в .npy + .parquet")
+    p_snap.add_argument("collection")
+    p_snap.add_argument("--out", help="Каталог snapshot, путь в ФС (по умолчанию SNAPSHOT_DIR/<collection>)")
+
+    p_restore = sub.add_parser("restore", help="Создать коллекцию из snapshot без пересчёта эмбеддингов")
+    p_restore.add_argument("path", help="Каталог snapshot, путь в ФС")
+    p_restore.add_argument("--collection", help="Целевая коллекция (по умолчанию — исходная)")
+    p_restore.add_argument("--profile", help="Профиль хранения: full | float16 | sq8 | compact")
+    p_restore.add_argument("--chunk-size", type=int)
+    p_restore.add_argument("--workers", type=int)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.command == "snapshot":
+        result = snapshot.export_snapshot(args.collection, args.out)
+    else:
+        result = snapshot.restore_snapshot(
+            args.path,
+            args.collection,
+            profile=args.profile,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+        )
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
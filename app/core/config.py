@@ -6,7 +6,23 @@ class Settings(BaseSettings):
     app_env: str = "local"
     milvus_host: str = "localhost"
     milvus_port: int = 19530
+    # full | float16 | sq8 | compact — см. app.services.milvus.STORAGE_PROFILES
+    milvus_storage_profile: str = "full"
+    milvus_pool_size: int = 4
+    milvus_health_interval: float = 30.0  # сек между проверками живости соединения
+    milvus_ping_timeout: float = 2.0      # сек на проверку живости
+    milvus_connect_retries: int = 3
+    milvus_retry_backoff: float = 0.5     # сек, удваивается с каждой попыткой
+    # группы роутеров через запятую: ingest | search | admin
+    api_groups: str = "ingest,search,admin"
     redis_url: str = "redis://localhost:6379/0"
+    ingest_workers: int | None = None  # None → os.cpu_count()
+    # лимит на один workbook в /ingest/upload; размер самого HTTP-запроса
+    # не ограничивает — его ограничивайте на reverse proxy
+    ingest_max_upload_mb: int = 64
+    snapshot_dir: str = "snapshots"
+    snapshot_chunk_size: int = 5_000
+    snapshot_workers: int = 4
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -1,12 +1,34 @@
+import sys
+from contextlib import asynccontextmanager
+from importlib import import_module
+
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import ingest as ingest_router
-from app.api import vectorize as vectorize_router
-from app.api import milvus_admin as milvus_router
+from app.core.config import get_settings
+
+# Router groups that can be switched on/off with API_GROUPS, e.g.
+# API_GROUPS=search → search-only process, API_GROUPS=admin → admin-only.
+# Modules are imported only for enabled groups.
+ROUTER_GROUPS: dict[str, list[tuple[str, str]]] = {
+    "ingest": [("app.api.ingest", "router"), ("app.api.vectorize", "router")],
+    "search": [("app.api.milvus_admin", "search_router")],
+    "admin": [("app.api.milvus_admin", "router")],
+}
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    yield
+    # Shutdown: release pools of the services this process actually loaded.
+    if "app.services.ingest_pool" in sys.modules:
+        sys.modules["app.services.ingest_pool"].shutdown_executor()
+    if "app.services.milvus" in sys.modules:
+        sys.modules["app.services.milvus"].close_clients()
 
-app = FastAPI(title="Embedding System API", version="1.0.0")
+
+app = FastAPI(title="Embedding System API", version="1.0.0", lifespan=lifespan)
 
 origins = [
     "http://localhost:5173",  # Vite dev-сервер
@@ -26,6 +48,14 @@ async def health_check():
     return JSONResponse({"status": "ok"})
 
 # Domain routers -------------------------------------------------------------
-app.include_router(ingest_router.router)
-app.include_router(vectorize_router.router)
-app.include_router(milvus_router.router)
+def _enabled_groups() -> list[str]:
+    groups = [g.strip() for g in get_settings().api_groups.split(",") if g.strip()]
+    unknown = set(groups) - ROUTER_GROUPS.keys()
+    if unknown:
+        raise ValueError(f"Unknown API_GROUPS {sorted(unknown)}, expected {sorted(ROUTER_GROUPS)}")
+    return groups
+
+
+for _group in _enabled_groups():
+    for _module, _attr in ROUTER_GROUPS[_group]:
+        app.include_router(getattr(import_module(_module), _attr))
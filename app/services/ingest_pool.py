@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+"""Parallel workbook parsing for the ingest endpoints.
+
+`TestCaseLoader.load()` is pure CPU work (openpyxl + pandas), so running it
+inside an async handler blocks the event loop and uses a single core.  This
+module fans the parsing out across a shared :class:`ProcessPoolExecutor` and
+merges the per‑file results into one DataFrame that is stored in Redis under a
+single ``job_id``.
+
+Worker functions are module‑level so that they can be pickled by the pool.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import pandas as pd
+from pandas import DataFrame
+
+from app.core.config import get_settings
+from app.services.case_loader import TestCaseLoader
+
+logger = logging.getLogger(__name__)
+
+_SETTINGS = get_settings()
+
+# расширения, которые умеет читать pd.read_excel (через openpyxl)
+WORKBOOK_SUFFIXES: Tuple[str, ...] = (".xlsx", ".xlsm")
+
+
+@dataclass
+class WorkbookResult:
+    """Итог разбора одного файла: DataFrame кейсов или текст ошибки."""
+
+    filename: str
+    imported: int = 0
+    cases: DataFrame | None = None
+    error: str | None = None
+    not_found: bool = False  # ошибка — отсутствующий файл (HTTP 404, а не 422)
+
+
+@lru_cache
+def get_executor() -> ProcessPoolExecutor:
+    """Singleton process pool, sized from ``INGEST_WORKERS`` (default: CPU count).
+
+    ``spawn`` keeps workers from inheriting the event loop and open Redis /
+    Milvus sockets of the API process.
+    """
+    return ProcessPoolExecutor(
+        max_workers=_SETTINGS.ingest_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def shutdown_executor(executor: ProcessPoolExecutor | None = None) -> None:
+    """Shut the pool down and drop it from the cache (app shutdown / broken pool).
+
+    With *executor* given, the cache is only cleared if it still holds that
+    very pool, so a concurrent caller's fresh pool is not thrown away.
+    """
+    if not get_executor.cache_info().currsize:
+        return
+    current = get_executor()
+    if executor is None or executor is current:
+        get_executor.cache_clear()
+    (executor or current).shutdown(wait=False, cancel_futures=True)
+
+
+def aggregate_cases(cases: List[DataFrame]) -> DataFrame:
+    """Collapse per‑test‑case frames into one row per ``Id``."""
+    df_all = pd.concat(cases, ignore_index=True)
+    return (
+        df_all
+        .groupby("Id", as_index=False)
+        .agg({
+            "Direction":    "first",
+            "Section":      "first",
+            "TestCaseName": "first",
+            "Steps":        lambda s: " ".join(s.dropna()),
+            "ExpectedResult": "first",
+        })
+    )
+
+
+def parse_workbook(path: str) -> Tuple[int, DataFrame]:
+    """Worker: read + prepare + aggregate a single workbook.
+
+    Runs inside a pool process, hence the plain ``str`` argument and the
+    picklable ``(count, DataFrame)`` return value.
+    """
+    file_path = Path(path)
+    if not file_path.is_file():
+        raise FileNotFoundError(path)
+    cases = TestCaseLoader(file_path).load()
+    return len(cases), aggregate_cases(cases)
+
+
+def collect_workbooks(directory: str | Path) -> List[Path]:
+    """Return all workbooks directly inside *directory*, sorted by name."""
+    root = Path(directory).resolve()
+    if not root.is_dir():
+        raise FileNotFoundError(f"Directory not found: {root}")
+    return sorted(p for p in root.iterdir() if p.suffix.lower() in WORKBOOK_SUFFIXES)
+
+
+async def parse_many(paths: Sequence[Path], names: Sequence[str] | None = None) -> List[WorkbookResult]:
+    """Parse *paths* concurrently in the process pool.
+
+    Errors are captured per file instead of failing the whole batch; *names*
+    lets callers report the original upload names instead of temp paths.
+    """
+    names = list(names) if names is not None else [str(p) for p in paths]
+    outcomes = await _run_in_pool(paths)
+
+    # A worker died (e.g. OOM) → the whole pool is broken.  Rebuild it and
+    # retry the affected files once; a file that kills the pool again is
+    # reported as failed.
+    broken = [i for i, o in enumerate(outcomes) if isinstance(o, BrokenProcessPool)]
+    if broken:
+        logger.warning("✖  Ingest pool broken, restarting and retrying %s file(s)", len(broken))
+        retried = await _run_in_pool([paths[i] for i in broken])
+        for i, outcome in zip(broken, retried):
+            outcomes[i] = outcome
+
+    results: List[WorkbookResult] = []
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.warning("✖  Failed to ingest %s: %s", name, outcome)
+            if isinstance(outcome, FileNotFoundError):
+                error = f"File not found: {outcome}"
+            elif isinstance(outcome, BrokenProcessPool):
+                error = "Worker process died while parsing the file (out of memory?)"
+            else:
+                error = str(outcome)
+            results.append(WorkbookResult(
+                filename=name, error=error, not_found=isinstance(outcome, FileNotFoundError),
+            ))
+        else:
+            imported, df_cases = outcome
+            results.append(WorkbookResult(filename=name, imported=imported, cases=df_cases))
+    return results
+
+
+async def _run_in_pool(paths: Sequence[Path]) -> List[object]:
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    try:
+        outcomes = await asyncio.gather(
+            *(loop.run_in_executor(executor, parse_workbook, str(p)) for p in paths),
+            return_exceptions=True,
+        )
+    except BrokenProcessPool as exc:  # submit() on an already broken pool
+        outcomes = [exc] * len(paths)
+    if any(isinstance(o, BrokenProcessPool) for o in outcomes):
+        shutdown_executor(executor)
+    return list(outcomes)
+
+
+def merge_results(results: Sequence[WorkbookResult]) -> DataFrame | None:
+    """Concatenate successful per‑file frames; ``None`` if every file failed."""
+    frames = [r.cases for r in results if r.cases is not None]
+    if not frames:
+        return None
+    return pd.concat(frames, ignore_index=True)
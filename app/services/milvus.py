@@ -3,47 +3,193 @@
 This module exposes a public :func:`get_client` so that other services (e.g.
 Vectorizer) can depend on a stable interface instead of the previously
 underscore‑prefixed internal function.
+
+Collections are created according to a *storage profile* (``MILVUS_STORAGE_PROFILE``):
+
+=========  ================  =========  ===========================
+profile    vector type       index      text fields (steps/expected)
+=========  ================  =========  ===========================
+full       FLOAT_VECTOR      IVF_FLAT   in memory
+float16    FLOAT16_VECTOR    IVF_FLAT   mmap (on disk)
+sq8        FLOAT_VECTOR      IVF_SQ8    mmap (on disk)
+compact    FLOAT16_VECTOR    IVF_SQ8    mmap (on disk)
+=========  ================  =========  ===========================
+
+``full`` is the original schema.  In the other profiles the bulky VARCHAR
+payloads are memory‑mapped so they stay out of the resident vector hot path
+and are only read when a caller explicitly asks for them.
+
+Clients come from a small round‑robin pool (``MILVUS_POOL_SIZE``).  Nothing
+connects at import time; a slot connects on first use, is pinged at most every
+``MILVUS_HEALTH_INTERVAL`` seconds and is reconnected with exponential backoff
+when the ping fails.
 """
 from __future__ import annotations
 
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
 from functools import lru_cache
-from typing import Final, Optional
+from typing import Any, Dict, Final, List, Optional
 
+import numpy as np
 from pymilvus import DataType, FieldSchema, MilvusClient, CollectionSchema
 
 from app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 _SETTINGS = get_settings()
 _DEFAULT_DIM: Final[int] = 768
 
 
+@dataclass(frozen=True)
+class StorageProfile:
+    vector_type: DataType
+    index_type: str
+    mmap_text: bool
+
+
+STORAGE_PROFILES: Final[Dict[str, StorageProfile]] = {
+    "full": StorageProfile(DataType.FLOAT_VECTOR, "IVF_FLAT", mmap_text=False),
+    "float16": StorageProfile(DataType.FLOAT16_VECTOR, "IVF_FLAT", mmap_text=True),
+    "sq8": StorageProfile(DataType.FLOAT_VECTOR, "IVF_SQ8", mmap_text=True),
+    "compact": StorageProfile(DataType.FLOAT16_VECTOR, "IVF_SQ8", mmap_text=True),
+}
+
+# поля, которые хранят «тяжёлый» текст и отдаются только по запросу
+TEXT_FIELDS: Final[list[str]] = ["steps", "expected_result"]
+
+_NUMPY_DTYPES: Final[Dict[DataType, type]] = {
+    DataType.FLOAT_VECTOR: np.float32,
+    DataType.FLOAT16_VECTOR: np.float16,
+}
+
+
+def get_profile(name: Optional[str] = None) -> StorageProfile:
+    """Resolve a storage profile by name (defaults to ``MILVUS_STORAGE_PROFILE``)."""
+    name = name or _SETTINGS.milvus_storage_profile
+    try:
+        return STORAGE_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown storage profile '{name}', expected one of {sorted(STORAGE_PROFILES)}"
+        ) from None
+
+
+class _ClientPool:
+    """Round‑robin pool of :class:`MilvusClient` with liveness checks and retry."""
+
+    def __init__(
+        self, size: int, health_interval: float, ping_timeout: float, retries: int, backoff: float
+    ) -> None:
+        self._uri = f"http://{_SETTINGS.milvus_host}:{_SETTINGS.milvus_port}"
+        self._health_interval = health_interval
+        self._ping_timeout = ping_timeout
+        self._retries = max(retries, 1)
+        self._backoff = backoff
+        self._clients: List[Optional[MilvusClient]] = [None] * max(size, 1)
+        self._checked_at: List[float] = [0.0] * len(self._clients)
+        self._locks = [threading.Lock() for _ in self._clients]
+        self._cursor = itertools.count()
+
+    def get(self) -> MilvusClient:
+        slot = next(self._cursor) % len(self._clients)
+        with self._locks[slot]:
+            client = self._clients[slot]
+            if client is not None and self._is_fresh(slot):
+                return client
+            if client is not None and self._ping(client):
+                self._checked_at[slot] = time.monotonic()
+                return client
+            if client is not None:
+                logger.warning("Milvus connection in slot %s is dead, reconnecting", slot)
+                self._close(client)
+            client = self._clients[slot] = self._connect()
+            self._checked_at[slot] = time.monotonic()
+            return client
+
+    def close(self) -> None:
+        for slot, lock in enumerate(self._locks):
+            with lock:
+                if self._clients[slot] is not None:
+                    self._close(self._clients[slot])
+                    self._clients[slot] = None
+
+    def _is_fresh(self, slot: int) -> bool:
+        return time.monotonic() - self._checked_at[slot] < self._health_interval
+
+    def _ping(self, client: MilvusClient) -> bool:
+        # короткий timeout: пинг идёт под локом слота, зависший Milvus не должен его держать
+        try:
+            client.get_server_version(timeout=self._ping_timeout)
+            return True
+        except Exception:  # noqa: BLE001 – any failure means the channel is unusable
+            return False
+
+    @staticmethod
+    def _close(client: MilvusClient) -> None:
+        try:
+            client.close()
+        except Exception:  # noqa: BLE001
+            pass
+
+    def _connect(self) -> MilvusClient:
+        delay = self._backoff
+        last_exc: Exception | None = None
+        for attempt in range(1, self._retries + 1):
+            try:
+                return MilvusClient(uri=self._uri)
+            except Exception as exc:  # noqa: BLE001
+                last_exc = exc
+                if attempt < self._retries:
+                    logger.warning("Milvus connect attempt %s failed: %s – retry in %.1fs", attempt, exc, delay)
+                    time.sleep(delay)
+                    delay *= 2
+        raise ConnectionError(
+            f"Milvus at {self._uri} unreachable after {self._retries} attempts: {last_exc}"
+        ) from last_exc
+
+
 @lru_cache
-def _base_client() -> MilvusClient:  # noqa: D401 – factory
-    """Create or return a cached Milvus client."""
-    return MilvusClient(uri=f"http://{_SETTINGS.milvus_host}:{_SETTINGS.milvus_port}")
+def _pool() -> _ClientPool:  # noqa: D401 – factory
+    """Create or return the process‑wide client pool."""
+    return _ClientPool(
+        size=_SETTINGS.milvus_pool_size,
+        health_interval=_SETTINGS.milvus_health_interval,
+        ping_timeout=_SETTINGS.milvus_ping_timeout,
+        retries=_SETTINGS.milvus_connect_retries,
+        backoff=_SETTINGS.milvus_retry_backoff,
+    )
 
 
-def _ensure_collection(client: MilvusClient, name: str, dim: int = _DEFAULT_DIM) -> None:
+def _ensure_collection(
+    client: MilvusClient, name: str, dim: int = _DEFAULT_DIM, profile: Optional[str] = None
+) -> None:
     """Create collection *name* if it does not yet exist."""
     if client.has_collection(name):
         return
 
+    spec = get_profile(profile)
+    text_params: Dict[str, Any] = {"mmap_enabled": True} if spec.mmap_text else {}
     schema = CollectionSchema(
         fields=[
             FieldSchema(name="idx", dtype=DataType.INT64, is_primary=True),
-            FieldSchema(name="vector", dtype=DataType.FLOAT_VECTOR, dim=dim),
+            FieldSchema(name="vector", dtype=spec.vector_type, dim=dim),
             FieldSchema(name="inner_id", dtype=DataType.INT64),
             FieldSchema(name="direction_name", dtype=DataType.VARCHAR, max_length=1024),
             FieldSchema(name="section_name", dtype=DataType.VARCHAR, max_length=1024),
             FieldSchema(name="test_case_name", dtype=DataType.VARCHAR, max_length=1024),
-            FieldSchema(name="steps", dtype=DataType.VARCHAR, max_length=8192),
-            FieldSchema(name="expected_result", dtype=DataType.VARCHAR, max_length=8192),
+            FieldSchema(name="steps", dtype=DataType.VARCHAR, max_length=8192, **text_params),
+            FieldSchema(name="expected_result", dtype=DataType.VARCHAR, max_length=8192, **text_params),
         ]
     )
 
     index_params = client.prepare_index_params()
     index_params.add_index("idx", "STL_SORT")
-    index_params.add_index("vector", "IVF_FLAT", metric_type="COSINE", params={"nlist": 128})
+    index_params.add_index("vector", spec.index_type, metric_type="COSINE", params={"nlist": 128})
 
     client.create_collection(collection_name=name, schema=schema, index_params=index_params)
 
@@ -52,9 +198,38 @@ def _ensure_collection(client: MilvusClient, name: str, dim: int = _DEFAULT_DIM)
 # Public API
 # ---------------------------------------------------------------------------
 
-def get_client(collection_name: Optional[str] = None, *, dim: int = _DEFAULT_DIM) -> MilvusClient:  # noqa: D401
-    """Return the singleton Milvus client; optionally create *collection_name* if missing."""
-    client = _base_client()
+def get_client(
+    collection_name: Optional[str] = None, *, dim: int = _DEFAULT_DIM, profile: Optional[str] = None
+) -> MilvusClient:  # noqa: D401
+    """Return a healthy pooled Milvus client; optionally create *collection_name* if missing."""
+    client = _pool().get()
     if collection_name is not None:
-        _ensure_collection(client, collection_name, dim=dim)
+        _ensure_collection(client, collection_name, dim=dim, profile=profile)
     return client
+
+
+def close_clients() -> None:
+    """Close every pooled connection (called from the app lifespan on shutdown)."""
+    if _pool.cache_info().currsize:
+        _pool().close()
+
+
+def vector_dtype(client: MilvusClient, collection_name: str) -> type:
+    """NumPy dtype matching the ``vector`` field of an existing collection."""
+    for field in client.describe_collection(collection_name)["fields"]:
+        if field["name"] == "vector":
+            return _NUMPY_DTYPES[field["type"]]
+    raise ValueError(f"Collection '{collection_name}' has no 'vector' field")
+
+
+def decode_vector(value: Any, dtype: type = np.float32) -> np.ndarray:
+    """Turn a vector returned by Milvus into a NumPy array.
+
+    FLOAT16 vectors come back as raw ``bytes`` (possibly wrapped in a
+    one‑element list), FLOAT vectors as a list of floats.
+    """
+    if isinstance(value, list) and len(value) == 1 and isinstance(value[0], bytes):
+        value = value[0]
+    if isinstance(value, (bytes, bytearray)):
+        return np.frombuffer(value, dtype=dtype)
+    return np.asarray(value, dtype=dtype)
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+"""Snapshot export / restore of Milvus collections.
+
+A snapshot is a directory with three files:
+
+* ``vectors.npy``      – raw ``(N, dim)`` matrix in the collection's dtype
+  (float32 or float16), written through a memmap;
+* ``metadata.parquet`` – every scalar field, row *i* belongs to vector *i*,
+  written one row group per export batch;
+* ``manifest.json``    – collection name, dim, dtype, row count, timestamp.
+
+:func:`restore_snapshot` memory‑maps the matrix and bulk‑inserts it back into
+Milvus in parallel chunks, so a collection can be rebuilt without re‑running
+the Sentence‑Transformers model.  :func:`open_snapshot` gives read‑only,
+zero‑copy access to the same files for in‑process consumers (brute‑force
+cosine search, embedding lookup by ``idx``).
+
+Export streams ``query_iterator`` batches straight to disk, so its memory is
+bounded by one batch (``_EXPORT_BATCH`` rows), not by the collection size.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import get_settings
+from pymilvus import DataType
+
+from app.services.milvus import decode_vector, get_client, vector_dtype
+
+logger = logging.getLogger(__name__)
+
+_SETTINGS = get_settings()
+
+VECTORS_FILE = "vectors.npy"
+METADATA_FILE = "metadata.parquet"
+MANIFEST_FILE = "manifest.json"
+
+_EXPORT_BATCH = 5_000
+_SEARCH_BLOCK = 65_536  # строк матрицы за один matmul (ограничивает временный float32-буфер)
+
+# скалярные типы Milvus → имена фабрик pyarrow (pyarrow импортируется лениво)
+_ARROW_TYPES: Dict[DataType, str] = {
+    DataType.BOOL: "bool_",
+    DataType.INT8: "int8",
+    DataType.INT16: "int16",
+    DataType.INT32: "int32",
+    DataType.INT64: "int64",
+    DataType.FLOAT: "float32",
+    DataType.DOUBLE: "float64",
+    DataType.VARCHAR: "string",
+}
+
+
+def snapshot_path(name: str) -> Path:
+    """Directory of the snapshot called *name* (bare name, as the HTTP API gets it).
+
+    The result must stay strictly inside ``SNAPSHOT_DIR``; names such as
+    ``..`` are rejected with :class:`ValueError`.
+    """
+    root = Path(_SETTINGS.snapshot_dir).resolve()
+    path = (root / name).resolve()
+    if path.parent != root:
+        raise ValueError(f"Invalid snapshot name '{name}'")
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def export_snapshot(collection: str, out_dir: str | Path | None = None) -> Dict[str, Any]:
+    """Dump *collection* into *out_dir* and return its manifest.
+
+    *out_dir* is a plain filesystem path (default: ``SNAPSHOT_DIR/<collection>``).
+    Files are written to a unique hidden sibling directory, the manifest last,
+    and only a complete snapshot replaces an existing one (see
+    :func:`_swap_into_place`).  Concurrent exports never share a temp dir.
+    """
+    client = get_client()
+    if not client.has_collection(collection):
+        raise KeyError(f"Collection '{collection}' not found")
+
+    out_dir = Path(out_dir) if out_dir is not None else snapshot_path(collection)
+    out_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(dir=out_dir.parent, prefix=f".{out_dir.name}."))
+    try:
+        manifest = _write_snapshot(client, collection, tmp_dir, final_dir=out_dir)
+        _swap_into_place(tmp_dir, out_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    logger.info("☑  Snapshot of %s (%s rows) written to %s", collection, manifest["count"], out_dir)
+    return manifest
+
+
+def _swap_into_place(tmp_dir: Path, out_dir: Path) -> None:
+    """Replace *out_dir* with the finished *tmp_dir*.
+
+    Two renames, so not atomic: the previous snapshot is first moved to a
+    unique hidden ``.<name>.old.*`` directory and deleted only after the new
+    one is in place.  A crash in between leaves it there for manual recovery;
+    nothing removes such directories automatically.
+    """
+    if not out_dir.exists():
+        os.replace(tmp_dir, out_dir)
+        return
+    old_dir = Path(tempfile.mkdtemp(dir=out_dir.parent, prefix=f".{out_dir.name}.old."))
+    os.replace(out_dir, old_dir)  # rename поверх пустого каталога допустим
+    os.replace(tmp_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def _write_snapshot(client, collection: str, out_dir: Path, *, final_dir: Path) -> Dict[str, Any]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    fields = client.describe_collection(collection)["fields"]
+    dim = next(int(f["params"]["dim"]) for f in fields if f["name"] == "vector")
+    scalar = [f for f in fields if f["name"] != "vector"]
+    scalar_fields = [f["name"] for f in scalar]
+    unsupported = [f["name"] for f in scalar if f["type"] not in _ARROW_TYPES]
+    if unsupported:
+        raise ValueError(f"Cannot snapshot fields of unsupported type: {unsupported}")
+    schema = pa.schema([(f["name"], getattr(pa, _ARROW_TYPES[f["type"]])()) for f in scalar])
+    dtype = vector_dtype(client, collection)
+    count = client.query(collection_name=collection, filter="", output_fields=["count(*)"])[0]["count(*)"]
+
+    vectors = np.lib.format.open_memmap(
+        out_dir / VECTORS_FILE, mode="w+", dtype=dtype, shape=(count, dim)
+    )
+    writer = pq.ParquetWriter(out_dir / METADATA_FILE, schema)
+
+    iterator = client.query_iterator(
+        collection_name=collection,
+        batch_size=_EXPORT_BATCH,
+        filter="idx >= 0",
+        output_fields=scalar_fields + ["vector"],
+    )
+    written = 0
+    try:
+        while batch := iterator.next():
+            if written + len(batch) > count:
+                raise RuntimeError(f"Collection '{collection}' grew during export")
+            for offset, row in enumerate(batch):
+                vectors[written + offset] = decode_vector(row["vector"], dtype)
+            columns = {name: [row[name] for row in batch] for name in scalar_fields}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            written += len(batch)
+    finally:
+        iterator.close()
+        writer.close()
+
+    if written != count:
+        raise RuntimeError(f"Exported {written} rows, expected {count}")
+    vectors.flush()
+    del vectors
+
+    # манифест пишется последним: без него open_snapshot каталог не примет
+    manifest = {
+        "collection": collection,
+        "count": count,
+        "dim": dim,
+        "dtype": np.dtype(dtype).name,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "path": str(final_dir.resolve()),
+    }
+    (out_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+# ---------------------------------------------------------------------------
+# Read‑only access
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Snapshot:
+    """Memory‑mapped view of a snapshot directory."""
+
+    manifest: Dict[str, Any]
+    vectors: np.ndarray        # np.memmap, read‑only
+    metadata: pd.DataFrame
+    # idx → строка: отсортированные idx + перестановка, поиск за O(log N)
+    _sorted_ids: np.ndarray = field(init=False, repr=False)
+    _order: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        ids = self.metadata["idx"].to_numpy()
+        self._order = np.argsort(ids, kind="stable")
+        self._sorted_ids = ids[self._order]
+
+    def __len__(self) -> int:
+        return self.vectors.shape[0]
+
+    def vector(self, idx: int) -> np.ndarray:
+        """Embedding for primary key *idx* (a view into the memmap, no copy)."""
+        pos = int(np.searchsorted(self._sorted_ids, idx))
+        if pos == len(self._sorted_ids) or self._sorted_ids[pos] != idx:
+            raise KeyError(idx)
+        return self.vectors[self._order[pos]]
+
+    def search(self, query: np.ndarray, limit: int = 10) -> List[Dict[str, Any]]:
+        """Exact cosine top‑*limit* over the mapped matrix.
+
+        Vectors are stored normalised (see ``Vectorizer._encode``), so the dot
+        product equals cosine similarity.  The result mimics Milvus hits:
+        ``{"id", "distance", "entity"}``.
+        """
+        if len(self) == 0:
+            return []
+        query = np.asarray(query, dtype=np.float32)
+        query = query / np.linalg.norm(query)
+        scores = np.empty(len(self), dtype=np.float32)
+        for start in range(0, len(self), _SEARCH_BLOCK):
+            block = self.vectors[start:start + _SEARCH_BLOCK]
+            scores[start:start + len(block)] = block @ query
+
+        limit = min(limit, len(self))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        rows = self.metadata.iloc[top].to_dict(orient="records")
+        return [
+            {"id": int(row["idx"]), "distance": float(scores[pos]), "entity": row}
+            for pos, row in zip(top, rows)
+        ]
+
+
+def open_snapshot(path: str | Path) -> Snapshot:
+    """Open the snapshot directory *path* without copying the vector matrix into memory."""
+    root = Path(path)
+    manifest_file = root / MANIFEST_FILE
+    if not manifest_file.is_file():
+        raise FileNotFoundError(f"Snapshot not found: {root}")
+    manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+    vectors = np.load(root / VECTORS_FILE, mmap_mode="r")
+    metadata = pd.read_parquet(root / METADATA_FILE, memory_map=True)
+    if len(metadata) != vectors.shape[0]:
+        raise ValueError(f"Snapshot {root} is corrupted: {len(metadata)} rows vs {vectors.shape[0]} vectors")
+    return Snapshot(manifest=manifest, vectors=vectors, metadata=metadata)
+
+
+# ---------------------------------------------------------------------------
+# Restore
+# ---------------------------------------------------------------------------
+
+def restore_snapshot(
+    path: str | Path,
+    collection: Optional[str] = None,
+    *,
+    profile: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Bulk‑insert the snapshot directory *path* into a *new* Milvus collection.
+
+    The target collection is created with *profile* (default:
+    ``MILVUS_STORAGE_PROFILE``); vectors are cast to its dtype chunk by chunk.
+    If any chunk fails, the half‑filled collection is dropped so the restore
+    can simply be retried.
+    """
+    snap = open_snapshot(path)
+    name = collection or snap.manifest["collection"]
+    chunk_size = chunk_size or _SETTINGS.snapshot_chunk_size
+    workers = workers or _SETTINGS.snapshot_workers
+
+    client = get_client()
+    if client.has_collection(name):
+        raise FileExistsError(f"Collection '{name}' already exists")
+    client = get_client(name, dim=snap.manifest["dim"], profile=profile)
+    dtype = vector_dtype(client, name)
+
+    def _insert(start: int) -> int:
+        vectors = snap.vectors[start:start + chunk_size].astype(dtype, copy=False)
+        rows = snap.metadata.iloc[start:start + chunk_size].to_dict(orient="records")
+        for row, vector in zip(rows, vectors):
+            row["vector"] = vector
+        client.insert(collection_name=name, data=rows)
+        return len(rows)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            restored = sum(pool.map(_insert, range(0, len(snap), chunk_size)))
+        client.flush(collection_name=name)
+    except BaseException:
+        logger.warning("✖  Restore into %s failed, dropping partial collection", name)
+        client.drop_collection(collection_name=name)
+        raise
+
+    logger.info("☑  Restored %s rows into %s", restored, name)
+    return {"restored": restored, "collection": name}
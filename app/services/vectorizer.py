@@ -7,17 +7,40 @@ computes sentence‐level embeddings with **Sentence‑Transformers** and return
 vectors ready for insertion into Milvus.  The class deliberately contains no
 FastAPI‑specific logic so that it can be reused from a CLI, background worker
 or unit tests.
+
+``torch`` and ``sentence_transformers`` are imported lazily, on the first
+:meth:`Vectorizer._encode` call, so importing this module (and therefore
+``app.main``) stays cheap for processes that never embed anything.
 """
+from functools import lru_cache
 from io import StringIO
-from typing import List
+from typing import TYPE_CHECKING, List
 
 import numpy as np
 import pandas as pd
-import torch
-from sentence_transformers import SentenceTransformer
 
 from app.services import cache
 from app.services.milvus import get_client as get_milvus_client  # thin helper assumed
+from app.services.milvus import vector_dtype
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+
+def _default_device() -> str:
+    import torch
+
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+@lru_cache
+def _load_model(name: str, device: str) -> SentenceTransformer:
+    """Load the model once per (name, device) and keep it for later requests."""
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(name, device=device)
+    model.max_seq_length = 512  # safety cap
+    return model
 
 
 class Vectorizer:
@@ -27,7 +50,7 @@ class Vectorizer:
 
     def __init__(self, job_id: str, *, device: str | None = None) -> None:
         self.job_id = job_id
-        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.device = device  # None → определяется при первом _encode
         self.model: SentenceTransformer | None = None
         self.df: pd.DataFrame | None = None
         self.embeddings: np.ndarray | None = None
@@ -53,9 +76,12 @@ class Vectorizer:
 
     # ------------------------------------------------------------
     def _encode(self, df: pd.DataFrame) -> np.ndarray:
+        import torch
+
+        if self.device is None:
+            self.device = _default_device()
         if self.model is None:
-            self.model = SentenceTransformer(self.MODEL_NAME, device=self.device)
-            self.model.max_seq_length = 512  # safety cap
+            self.model = _load_model(self.MODEL_NAME, self.device)
 
         # Glue relevant fields into a single text per row
         sentences: List[str] = (
@@ -85,10 +111,12 @@ class Vectorizer:
             collection_name=collection,
             dim=self.embeddings.shape[1]
         )
+        # float16‑профили ждут np.float16, остальные — float32
+        vectors = self.embeddings.astype(vector_dtype(client, collection), copy=False)
 
         # Build rows for bulk insert
         rows = []
-        for i, (emb, row) in enumerate(zip(self.embeddings, self.df.itertuples())):
+        for i, (emb, row) in enumerate(zip(vectors, self.df.itertuples())):
             rows.append({
                 "idx": i,
                 "vector": emb,
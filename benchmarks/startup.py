@@ -0,0 +1,87 @@
+"""Import‑cost / startup‑time guard for ``app.main``.
+
+Imports ``app.main`` in fresh interpreters (one per ``API_GROUPS`` variant),
+reports the median wall time, the most expensive top‑level imports from
+``python -X importtime`` and exits non‑zero when
+
+* a forbidden heavy module (``torch``, ``sentence_transformers`` …) got
+  imported, or
+* the median import time exceeds ``--max-seconds``.
+
+    python -m benchmarks.startup --runs 5 --max-seconds 3
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+FORBIDDEN = ("torch", "sentence_transformers", "transformers")
+VARIANTS = {
+    "full": "ingest,search,admin",
+    "search-only": "search",
+    "admin-only": "admin",
+}
+
+_PROBE = (
+    "import json, sys, time; t = time.perf_counter(); import app.main; "
+    "print(json.dumps({'seconds': time.perf_counter() - t, "
+    "'modules': sorted(m for m in sys.modules if '.' not in m)}))"
+)
+
+
+def _run(groups: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    env = {**os.environ, "API_GROUPS": groups}
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", _PROBE]
+    return subprocess.run(cmd, env=env, capture_output=True, text=True, check=True)
+
+
+def _top_imports(stderr: str, top: int) -> List[Tuple[int, str]]:
+    """Parse ``-X importtime`` output → [(cumulative µs, module)] for top‑level modules."""
+    costs: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, raw = line[len("import time:"):].split("|")
+        name = raw.strip()
+        if len(raw) - len(raw.lstrip()) == 1 and "." not in name:  # depth 0 → one leading space
+            costs[name] = max(costs.get(name, 0), int(cumulative))
+    return sorted(((us, name) for name, us in costs.items()), reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=3.0)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    failed = False
+    for variant, groups in VARIANTS.items():
+        timings, modules = [], set()
+        for _ in range(args.runs):
+            probe = json.loads(_run(groups).stdout)
+            timings.append(probe["seconds"])
+            modules.update(probe["modules"])
+        median = statistics.median(timings)
+        heavy = sorted(m for m in FORBIDDEN if m in modules)
+
+        print(f"\n[{variant}] API_GROUPS={groups}: median {median:.2f}s over {args.runs} runs")
+        for us, name in _top_imports(_run(groups, importtime=True).stderr, args.top):
+            print(f"  {us / 1e6:7.3f}s  {name}")
+        if heavy:
+            print(f"  ✖ heavy modules imported at startup: {', '.join(heavy)}")
+            failed = True
+        if median > args.max_seconds:
+            print(f"  ✖ import time {median:.2f}s exceeds {args.max_seconds:.2f}s")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
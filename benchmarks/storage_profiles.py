@@ -0,0 +1,193 @@
+"""Memory‑footprint and search‑latency benchmark for Milvus storage profiles.
+
+Compares every profile from :data:`app.services.milvus.STORAGE_PROFILES`
+against the original schema (``full`` profile + ``vector`` in the output
+fields, as ``/milvus/search`` used to return it).
+
+Needs a running Milvus (``docker compose up standalone``) with its metrics
+port reachable::
+
+    python -m benchmarks.storage_profiles --rows 20000 --queries 200
+
+Columns:
+
+* ``load MB`` – *measured*: growth of the Milvus process RSS
+  (``process_resident_memory_bytes`` from ``/metrics``) between
+  ``release_collection`` and ``load_collection``.  Standalone Milvus runs the
+  query node in the same process, so this is the real in‑memory footprint of
+  the loaded collection (±GC noise; use larger ``--rows`` for stable numbers);
+* ``est. MB`` – theoretical estimate for comparison: index (4 B/dim float32,
+  2 B/dim float16, 1 B/dim SQ8) plus the raw vector field when the index
+  does not keep raw data (IVF_SQ8), plus text fields unless they are mmap‑ed;
+* ``p50 / p95 ms`` – client‑side ``search`` latency;
+* ``resp KB`` – JSON size of one search response;
+* ``recall@k`` – overlap with exact float32 brute‑force top‑k.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+import urllib.request
+from typing import Dict, List
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.services.milvus import STORAGE_PROFILES, TEXT_FIELDS, get_client, get_profile
+
+_BASE_FIELDS = ["idx", "inner_id", "direction_name", "section_name", "test_case_name"]
+_INDEX_BYTES = {"IVF_FLAT": None, "IVF_SQ8": 1}  # None → размер самого вектора
+_INDEX_HAS_RAW = {"IVF_FLAT": True, "IVF_SQ8": False}  # иначе Milvus грузит ещё и сырое поле
+_RSS_METRIC = "process_resident_memory_bytes"
+
+
+def _random_unit(rng: np.random.Generator, n: int, dim: int) -> np.ndarray:
+    vecs = rng.standard_normal((n, dim), dtype=np.float32)
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+def _np_dtype(profile: str) -> type:
+    return np.float16 if get_profile(profile).vector_type.name == "FLOAT16_VECTOR" else np.float32
+
+
+def _json_default(obj):
+    if isinstance(obj, bytes):
+        return obj.hex()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return dict(obj)
+
+
+def _rows(vectors: np.ndarray, text: str, offset: int) -> List[Dict]:
+    return [
+        {
+            "idx": offset + i,
+            "vector": v,
+            "inner_id": offset + i,
+            "direction_name": "bench",
+            "section_name": "bench",
+            "test_case_name": f"case {offset + i}",
+            "steps": text,
+            "expected_result": text,
+        }
+        for i, v in enumerate(vectors)
+    ]
+
+
+def _estimated_mb(profile: str, rows: int, dim: int, text_bytes: int) -> float:
+    spec = get_profile(profile)
+    vec_bytes = 2 if spec.vector_type.name == "FLOAT16_VECTOR" else 4
+    index_bytes = _INDEX_BYTES[spec.index_type] or vec_bytes
+    total = rows * dim * index_bytes
+    if not _INDEX_HAS_RAW[spec.index_type]:
+        total += rows * dim * vec_bytes
+    if not spec.mmap_text:
+        total += rows * text_bytes * len(TEXT_FIELDS)
+    return total / 2**20
+
+
+def _rss_bytes(metrics_url: str) -> float:
+    with urllib.request.urlopen(metrics_url, timeout=10) as resp:
+        for line in resp.read().decode().splitlines():
+            if line.startswith(_RSS_METRIC + " "):
+                return float(line.split()[1])
+    raise RuntimeError(f"{_RSS_METRIC} not found at {metrics_url}")
+
+
+def _measured_load_mb(client, collection: str, metrics_url: str, settle: float) -> float:
+    """RSS growth of the Milvus process caused by loading *collection*."""
+    client.release_collection(collection_name=collection)
+    time.sleep(settle)
+    before = _rss_bytes(metrics_url)
+    client.load_collection(collection_name=collection)
+    time.sleep(settle)
+    return (_rss_bytes(metrics_url) - before) / 2**20
+
+
+def _bench(client, collection: str, profile: str, queries: np.ndarray, exact: np.ndarray,
+           out_fields: List[str], limit: int) -> Dict[str, float]:
+    dtype = _np_dtype(profile)
+    timings, hits_all = [], []
+    for q in queries:
+        started = time.perf_counter()
+        hits = client.search(
+            collection_name=collection,
+            anns_field="vector",
+            data=[q.astype(dtype)],
+            limit=limit,
+            output_fields=out_fields,
+            search_params={"metric_type": "COSINE", "params": {"nprobe": 16}},
+        )
+        timings.append((time.perf_counter() - started) * 1000)
+        hits_all.append(hits[0])
+
+    recall = np.mean([
+        len({h["id"] for h in hits} & set(truth.tolist())) / limit
+        for hits, truth in zip(hits_all, exact)
+    ])
+    sample = json.dumps([dict(h) for h in hits_all[0]], default=_json_default)
+    return {
+        "p50": statistics.median(timings),
+        "p95": float(np.percentile(timings, 95)),
+        "resp_kb": len(sample) / 1024,
+        "recall": float(recall),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--text-bytes", type=int, default=2_048, help="Длина steps / expected_result")
+    parser.add_argument("--profiles", default=",".join(STORAGE_PROFILES))
+    parser.add_argument("--keep", action="store_true", help="Не удалять коллекции после прогона")
+    parser.add_argument(
+        "--metrics-url", default=f"http://{get_settings().milvus_host}:9091/metrics",
+        help="Prometheus-эндпоинт Milvus standalone",
+    )
+    parser.add_argument("--settle", type=float, default=3.0, help="Пауза перед замером RSS, сек")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    vectors = _random_unit(rng, args.rows, args.dim)
+    queries = _random_unit(rng, args.queries, args.dim)
+    exact = np.argsort(-(queries @ vectors.T), axis=1)[:, : args.limit]
+    text = "x" * args.text_bytes
+
+    cases = [("baseline", "full", _BASE_FIELDS + ["vector"])]
+    cases += [(name, name, _BASE_FIELDS) for name in args.profiles.split(",")]
+
+    print(
+        f"{'case':<10} {'load MB':>9} {'est. MB':>9} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'resp KB':>8} {'recall@k':>9}"
+    )
+    for label, profile, out_fields in cases:
+        collection = f"bench_storage_{profile}"
+        client = get_client()
+        if client.has_collection(collection):
+            client.drop_collection(collection)
+        client = get_client(collection, dim=args.dim, profile=profile)
+
+        cast = vectors.astype(_np_dtype(profile))
+        for start in range(0, args.rows, 2_000):
+            client.insert(collection_name=collection, data=_rows(cast[start:start + 2_000], text, start))
+        client.flush(collection_name=collection)
+        load_mb = _measured_load_mb(client, collection, args.metrics_url, args.settle)
+
+        stats = _bench(client, collection, profile, queries, exact, out_fields, args.limit)
+        print(
+            f"{label:<10} {load_mb:>9.1f} {_estimated_mb(profile, args.rows, args.dim, args.text_bytes):>9.1f} "
+            f"{stats['p50']:>8.2f} {stats['p95']:>8.2f} {stats['resp_kb']:>8.1f} {stats['recall']:>9.3f}"
+        )
+        if not args.keep:
+            client.drop_collection(collection)
+
+
+if __name__ == "__main__":
+    main()